@@ -3,6 +3,7 @@ from flask import Flask, jsonify
 from flask_cors import CORS
 from config import Config
 from extensions import db, ma, migrate, jwt
+from datasets import set_memory_budget
 
 def create_app():
     app = Flask(__name__)
@@ -18,11 +19,18 @@ def create_app():
     migrate.init_app(app, db)
     jwt.init_app(app)
 
+    # POI datasets load lazily per region; this caps what a worker keeps
+    set_memory_budget(app.config["DATASET_MEMORY_BUDGET_MB"])
+
     # register blueprints
     from routes import api_bp, data_bp
     app.register_blueprint(api_bp, url_prefix="/api")
     app.register_blueprint(data_bp, url_prefix="/api")
 
+    # flask load-pois: fill the PostGIS poi table from Datapoints/
+    from poi_store import load_pois_command
+    app.cli.add_command(load_pois_command)
+
     @app.get("/health")
     def health():
         return jsonify(status="ok"), 200
@@ -0,0 +1,219 @@
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from datasets import POI_TYPES, REGIONS, load_dataset
+
+
+# ranking weight per source: places users actually geocoded before rank first
+SOURCE_WEIGHTS = {"geocode": 2, "dataset": 1}
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text):
+    """Casefold and strip accents so "Straße" / "strasse" and "Müller" / "muller" meet"""
+    text = unicodedata.normalize("NFKD", text.casefold().replace("ß", "ss"))
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def tokens(text):
+    return _WORD.findall(normalize(text))
+
+
+class PrefixIndex:
+    """
+    Sorted (token, entry id) list answering prefix lookups with bisect.
+    Every query token must prefix-match some token of an entry's label.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self._keys = []
+        # entry id -> (label, coords, source, poi_type, label tokens), oldest first
+        self._entries = OrderedDict()
+        self._by_label = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, label, coords, source, poi_type=None):
+        """Index a label once; later duplicates (same normalized text) are ignored"""
+        label = " ".join(label.split())
+        key = normalize(label)
+        if not key:
+            return
+        with self._lock:
+            if key in self._by_label:
+                return
+            entry_id = self._next_id
+            self._next_id += 1
+            label_tokens = tokens(label)
+            self._entries[entry_id] = (label, coords, source, poi_type, label_tokens)
+            self._by_label[key] = entry_id
+            for token in set(label_tokens):
+                insort(self._keys, (token, entry_id))
+
+            if self.maxsize and len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, entry_id):
+        label, _, _, _, label_tokens = self._entries.pop(entry_id)
+        del self._by_label[normalize(label)]
+        for token in set(label_tokens):
+            i = bisect_left(self._keys, (token, entry_id))
+            del self._keys[i]
+
+    def search(self, query, limit, where=None):
+        """
+        Return up to limit (rank, entry) tuples for a type-ahead query,
+        optionally only entries whose [lon, lat] satisfy where(lon, lat)
+        """
+        query_tokens = tokens(query)
+        if not query_tokens:
+            return []
+        # the longest token is usually the most selective one
+        lead = max(query_tokens, key=len)
+
+        with self._lock:
+            # walk the matching run in place; slicing would copy the whole tail
+            candidates = set()
+            for i in range(bisect_left(self._keys, (lead,)), len(self._keys)):
+                token, entry_id = self._keys[i]
+                if not token.startswith(lead):
+                    break
+                candidates.add(entry_id)
+
+            ranked = []
+            for entry_id in candidates:
+                entry = self._entries[entry_id]
+                label, coords, source, _, label_tokens = entry
+                if where is not None and not where(*coords):
+                    continue
+                if not all(any(t.startswith(q) for t in label_tokens) for q in query_tokens):
+                    continue
+                exact = sum(q in label_tokens for q in query_tokens)
+                ranked.append(((-exact, -SOURCE_WEIGHTS[source], len(label), label), entry))
+
+        ranked.sort(key=lambda r: r[0])
+        return ranked[:limit]
+
+
+class RecentMisses:
+    """Bounded set of keys that found nothing, each forgotten after ttl seconds"""
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._expiry = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            expires = self._expiry.get(key)
+            if expires is None:
+                return False
+            if expires < time.monotonic():
+                del self._expiry[key]
+                return False
+            return True
+
+    def add(self, key):
+        with self._lock:
+            self._expiry[key] = time.monotonic() + self.ttl
+            self._expiry.move_to_end(key)
+            while len(self._expiry) > self.maxsize:
+                self._expiry.popitem(last=False)
+
+
+# previously successful geocodes of all regions; suggest() keeps those inside the requested one
+GEOCODED = PrefixIndex(maxsize=5000)
+
+# region indexes kept per worker; least recently used ones are dropped and rebuilt on demand
+MAX_REGION_INDEXES = 4
+
+_region_indexes = OrderedDict()
+# guards the two dicts; each region's index is built under its own lock
+_region_lock = threading.Lock()
+_build_locks = {}
+
+
+def _dataset_labels(poi_type, properties):
+    """Place names a dataset feature contributes to the index"""
+    if poi_type == "toilet":
+        return [properties.get("standort")]
+    if poi_type == "parking":
+        standort = properties.get("standort")
+        area = " ".join(str(v) for v in (properties.get("plz"), properties.get("ortsteil")) if v)
+        return [f"{standort}, {area}" if standort and area else standort]
+    return [(properties.get("tags") or {}).get("name")]
+
+
+def region_index(base, region):
+    """
+    Build a region's place-name index on first use. Only labels and
+    coordinates are kept, so the datasets themselves may be evicted later;
+    at most MAX_REGION_INDEXES indexes stay built.
+    """
+    with _region_lock:
+        index = _region_indexes.get(region)
+        if index is not None:
+            _region_indexes.move_to_end(region)
+            return index
+        build_lock = _build_locks.setdefault(region, threading.Lock())
+
+    with build_lock:
+        with _region_lock:
+            index = _region_indexes.get(region)
+        if index is not None:
+            return index
+
+        index = PrefixIndex()
+        for poi_type in POI_TYPES:
+            dataset = load_dataset(base, poi_type, region)
+            if not dataset:
+                continue
+            for feature in dataset.features:
+                for label in _dataset_labels(poi_type, feature["properties"]):
+                    if label:
+                        index.add(label, feature["geometry"]["coordinates"], "dataset", poi_type)
+
+        with _region_lock:
+            _region_indexes[region] = index
+            while len(_region_indexes) > MAX_REGION_INDEXES:
+                _region_indexes.popitem(last=False)
+    return index
+
+
+def remember_geocode(label, lon, lat):
+    """Record a successful Nominatim result for later type-ahead queries"""
+    GEOCODED.add(label, [lon, lat], "geocode")
+
+
+def suggest(base, query, limit, region):
+    """Ranked suggestions from the region's datasets and past geocodes inside its bbox"""
+    if region not in REGIONS:
+        return []
+    ranked = (
+        region_index(base, region).search(query, limit)
+        + GEOCODED.search(query, limit, where=REGIONS[region].contains)
+    )
+    ranked.sort(key=lambda r: r[0])
+
+    suggestions = []
+    seen = set()
+    for _, (label, coords, source, poi_type, _) in ranked:
+        if label in seen:
+            continue
+        seen.add(label)
+        suggestion = {"label": label, "coords": coords, "source": source}
+        if poi_type:
+            suggestion["poi_type"] = poi_type
+        suggestions.append(suggestion)
+        if len(suggestions) == limit:
+            break
+    return suggestions
@@ -7,4 +7,8 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY")
     SQLALCHEMY_DATABASE_URI = os.getenv("SQLALCHEMY_DATABASE_URI") or os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
\ No newline at end of file
+    JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+    # "files" serves POIs from Datapoints/, "postgis" enables the SQL-backed /api/pois queries
+    POI_BACKEND = os.getenv("POI_BACKEND", "files")
+    # total source-file size of POI datasets kept in memory per worker before LRU eviction
+    DATASET_MEMORY_BUDGET_MB = float(os.getenv("DATASET_MEMORY_BUDGET_MB", "512"))
@@ -0,0 +1,222 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pyproj import CRS, Transformer
+from poi_index import KDTree
+from opening_hours import parse_opening_hours
+
+
+POI_TYPES = ("toilet", "elevator", "parking")
+
+DEFAULT_REGION = "berlin"
+
+
+class Region:
+    """
+    One city's POI files. `crs` is the CRS the files are stored in,
+    `metric_crs` a projected CRS for the k-NN index (defaults to `crs`,
+    which then has to be projected itself),
+    `bbox` is (min_lon, min_lat, max_lon, max_lat) in WGS84 and decides
+    which requests touch the region.
+    """
+
+    def __init__(self, name, crs, bbox, files, directory=None, metric_crs=None, osm_area=None):
+        self.name = name
+        self.crs = crs
+        self.metric_crs = metric_crs or crs
+        # k-NN distances are read as metres; a geographic CRS would silently yield degrees
+        if not CRS.from_user_input(self.metric_crs).is_projected:
+            raise ValueError(f"region {name}: metric_crs {self.metric_crs} is not a projected CRS")
+        self.bbox = bbox
+        self.files = files
+        # files live under Datapoints/<directory>/
+        self.directory = name if directory is None else directory
+        # (name, admin_level) of the OSM boundary, used by scripts/fetch_elevators_berlin.py
+        self.osm_area = osm_area
+
+    def path(self, base, poi_type):
+        return os.path.join(base, "Datapoints", self.directory, self.files[poi_type])
+
+    def contains(self, lon, lat):
+        min_lon, min_lat, max_lon, max_lat = self.bbox
+        return min_lon <= lon <= max_lon and min_lat <= lat <= max_lat
+
+    def intersects(self, min_lon, min_lat, max_lon, max_lat):
+        r_min_lon, r_min_lat, r_max_lon, r_max_lat = self.bbox
+        return not (
+            max_lon < r_min_lon or min_lon > r_max_lon
+            or max_lat < r_min_lat or min_lat > r_max_lat
+        )
+
+
+REGIONS = {
+    region.name: region for region in (
+        Region(
+            "berlin",
+            crs="EPSG:25833",
+            bbox=(13.08, 52.33, 13.77, 52.68),
+            files={
+                "toilet": "toilets.json",
+                "elevator": "elevators.json",
+                "parking": "accessible_parking.json",
+            },
+            # Berlin predates the registry and keeps its files at the Datapoints/ root
+            directory="",
+            osm_area=("Berlin", 4),
+        ),
+    )
+}
+
+# poi_type -> where the free-text opening hours live in a feature's properties.
+# OSM elevators without an opening_hours tag are treated as always available.
+OPENING_HOURS_FIELDS = {
+    "toilet": lambda props: props.get("oeffnungszeiten"),
+    "elevator": lambda props: (props.get("tags") or {}).get("opening_hours", "24/7"),
+    "parking": lambda props: props.get("bemerkung"),
+}
+
+# Loaded datasets in least-recently-used order, bounded by the total size of
+# their source files (a stable proxy for their in-memory footprint).
+_cache = OrderedDict()
+_cache_bytes = 0
+_memory_budget = 512 * 1024 * 1024
+# guards _cache/_cache_bytes/_load_locks only; file parsing runs under the per-path lock
+_lock = threading.Lock()
+_load_locks = {}
+
+
+@lru_cache(maxsize=None)
+def transformer(source_crs, target_crs):
+    return Transformer.from_crs(source_crs, target_crs, always_xy=True)
+
+
+class Dataset:
+    """
+    One POI file loaded into memory: features with WGS84 coordinates,
+    their opening hours compiled once, and a k-NN index over the
+    region's metric coordinates.
+    """
+
+    def __init__(self, region, poi_type, collection, size=0):
+        self.region = region
+        self.poi_type = poi_type
+        self.collection = collection
+        self.size = size
+        self.features = []
+        self.opening_hours = []
+        hours_field = OPENING_HOURS_FIELDS[poi_type]
+        to_wgs84 = transformer(region.crs, "EPSG:4326")
+        to_metric = transformer(region.crs, region.metric_crs)
+        points = []
+
+        for feature in collection.get("features", []):
+            geom = feature.get("geometry")
+            if not geom or geom.get("type") != "Point":
+                continue
+            x, y = geom["coordinates"]
+            lon, lat = to_wgs84.transform(x, y)
+            geom["coordinates"] = [lon, lat]
+            if region.metric_crs != region.crs:
+                x, y = to_metric.transform(x, y)
+            properties = feature.setdefault("properties", {})
+            properties["poi_type"] = poi_type
+            points.append((x, y, len(self.features)))
+            self.features.append(feature)
+            self.opening_hours.append(parse_opening_hours(hours_field(properties)))
+
+        self.index = KDTree(points)
+
+    def is_open(self, i, when):
+        """Unknown opening hours count as not open"""
+        hours = self.opening_hours[i]
+        return hours is not None and hours.is_open(when)
+
+    def open_features(self, when=None):
+        """All features, or only those open at `when` (local Berlin datetime)"""
+        if when is None:
+            return self.features
+        return [f for i, f in enumerate(self.features) if self.is_open(i, when)]
+
+    def nearest(self, lon, lat, k, when=None):
+        """Return up to k (distance_m, feature) tuples around a WGS84 point"""
+        x, y = transformer("EPSG:4326", self.region.metric_crs).transform(lon, lat)
+        predicate = None if when is None else (lambda i: self.is_open(i, when))
+        return [
+            (dist, self.features[i])
+            for dist, i in self.index.nearest(x, y, k, predicate)
+        ]
+
+
+def set_memory_budget(megabytes):
+    """Upper bound for the source-file size of all datasets kept loaded"""
+    global _memory_budget
+    with _lock:
+        _memory_budget = int(megabytes * 1024 * 1024)
+        _evict()
+
+
+def _evict():
+    """Drop least recently used shards until under budget, never the newest one; caller holds _lock"""
+    global _cache_bytes
+    while _cache_bytes > _memory_budget and len(_cache) > 1:
+        _, evicted = _cache.popitem(last=False)
+        _cache_bytes -= evicted.size
+
+
+def _cached(path):
+    """Cache hit bumped to most recently used, or None"""
+    with _lock:
+        dataset = _cache.get(path)
+        if dataset is not None:
+            _cache.move_to_end(path)
+        return dataset
+
+
+def regions_at(lon, lat):
+    return [region for region in REGIONS.values() if region.contains(lon, lat)]
+
+
+def regions_in_bbox(min_lon, min_lat, max_lon, max_lat):
+    return [
+        region for region in REGIONS.values()
+        if region.intersects(min_lon, min_lat, max_lon, max_lat)
+    ]
+
+
+def load_dataset(base, poi_type, region=DEFAULT_REGION):
+    """
+    Load a region's POI dataset on first use and keep it while it fits the
+    memory budget; None if the region has no such file.
+    """
+    global _cache_bytes
+    region = REGIONS[region] if isinstance(region, str) else region
+    if poi_type not in region.files:
+        return None
+    path = region.path(base, poi_type)
+
+    dataset = _cached(path)
+    if dataset is not None:
+        return dataset
+    with _lock:
+        load_lock = _load_locks.setdefault(path, threading.Lock())
+
+    # one thread parses a given file; others wanting it wait, everyone else carries on
+    with load_lock:
+        dataset = _cached(path)
+        if dataset is not None:
+            return dataset
+
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            dataset = Dataset(region, poi_type, json.load(f), os.path.getsize(path))
+
+        with _lock:
+            _cache[path] = dataset
+            _cache_bytes += dataset.size
+            _evict()
+
+    return dataset
+
@@ -51,6 +51,17 @@ def get_metadata():
     return target_db.metadata
 
 
+# The poi table is managed by the hand-written revisions on the "poi" branch
+# (PostGIS only) and PostGIS brings spatial_ref_sys; keep both out of
+# autogenerated revisions so the main branch never needs PostGIS.
+EXCLUDED_TABLES = {'poi', 'spatial_ref_sys'}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    table = object if type_ == 'table' else getattr(object, 'table', None)
+    return table is None or table.name not in EXCLUDED_TABLES
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +76,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -100,6 +112,7 @@ def run_migrations_online():
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
+            include_object=include_object,
             **conf_args
         )
 
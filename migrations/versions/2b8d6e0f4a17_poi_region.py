@@ -0,0 +1,32 @@
+"""poi region column
+
+Revision ID: 2b8d6e0f4a17
+Revises: 7c1f3a9e52b4
+Create Date: 2026-10-19 13:40:22.081377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2b8d6e0f4a17'
+down_revision = '7c1f3a9e52b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('poi', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('region', sa.String(length=64), server_default='berlin', nullable=False))
+        batch_op.create_index(batch_op.f('ix_poi_region'), ['region'], unique=False)
+        batch_op.drop_constraint('uq_poi_type_source_id', type_='unique')
+        batch_op.create_unique_constraint('uq_poi_region_type_source_id', ['region', 'poi_type', 'source_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('poi', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_poi_region_type_source_id', type_='unique')
+        batch_op.create_unique_constraint('uq_poi_type_source_id', ['poi_type', 'source_id'])
+        batch_op.drop_index(batch_op.f('ix_poi_region'))
+        batch_op.drop_column('region')
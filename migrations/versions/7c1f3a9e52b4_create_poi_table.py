@@ -0,0 +1,54 @@
+"""create poi table (postgis)
+
+Revision ID: 7c1f3a9e52b4
+Revises: 
+Create Date: 2026-10-19 10:12:03.514220
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '7c1f3a9e52b4'
+down_revision = None
+# own branch so databases without PostGIS never see it: flask db upgrade poi@head
+branch_labels = ('poi',)
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS postgis;')
+
+    op.create_table('poi',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source_id', sa.String(length=64), nullable=False),
+    sa.Column('poi_type', sa.String(length=16), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=True),
+    sa.Column('district', sa.String(length=120), nullable=True),
+    sa.Column('wheelchair', sa.Boolean(), nullable=True),
+    sa.Column('barrier_reduced', sa.Boolean(), nullable=True),
+    sa.Column('changing_table', sa.Boolean(), nullable=True),
+    sa.Column('spaces', sa.Integer(), nullable=True),
+    sa.Column('opening_hours', sa.Text(), nullable=True),
+    sa.Column('properties', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('geom', geoalchemy2.types.Geometry(geometry_type='POINT', srid=4326, spatial_index=False), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('poi_type', 'source_id', name='uq_poi_type_source_id')
+    )
+    with op.batch_alter_table('poi', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_poi_poi_type'), ['poi_type'], unique=False)
+
+    # bbox queries use the geometry index, metre-based radius/corridor queries the geography one
+    op.execute('CREATE INDEX ix_poi_geom ON poi USING gist (geom);')
+    op.execute('CREATE INDEX ix_poi_geog ON poi USING gist ((geom::geography));')
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_poi_geog;')
+    op.execute('DROP INDEX IF EXISTS ix_poi_geom;')
+    with op.batch_alter_table('poi', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_poi_poi_type'))
+
+    op.drop_table('poi')
@@ -12,7 +12,8 @@ import sqlalchemy as sa
 # revision identifiers, used by Alembic.
 revision = 'd4e05be2d79d'
 down_revision = None
-branch_labels = None
+# the app schema; the optional PostGIS tables live on the separate "poi" branch
+branch_labels = ('main',)
 depends_on = None
 
 
@@ -2,6 +2,7 @@ from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 from extensions import db 
 from sqlalchemy.dialects.postgresql import JSONB
+from geoalchemy2 import Geometry
 
 class User(db.Model):
     __tablename__ = "user"
@@ -28,3 +29,26 @@ class Favorite(db.Model):
     route_data = db.Column(JSONB, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     user = db.relationship("User", backref=db.backref("favorites", lazy=True, cascade="all, delete-orphan"))
+
+class Poi(db.Model):
+    """Optional database copy of the Datapoints/ files (POI_BACKEND=postgis, "poi" migration branch)"""
+    __tablename__ = "poi"
+    __table_args__ = (
+        db.UniqueConstraint("region", "poi_type", "source_id", name="uq_poi_region_type_source_id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    region = db.Column(db.String(64), index=True, nullable=False, server_default="berlin")
+    source_id = db.Column(db.String(64), nullable=False)
+    poi_type = db.Column(db.String(16), index=True, nullable=False)
+    name = db.Column(db.String(255))
+    district = db.Column(db.String(120))
+    wheelchair = db.Column(db.Boolean)
+    barrier_reduced = db.Column(db.Boolean)
+    changing_table = db.Column(db.Boolean)
+    spaces = db.Column(db.Integer)
+    opening_hours = db.Column(db.Text)
+    # original feature properties as served by the file endpoints
+    properties = db.Column(JSONB, nullable=False)
+    # GiST indexes (geometry and geography) are created in the migration
+    geom = db.Column(Geometry("POINT", srid=4326, spatial_index=False), nullable=False)
@@ -0,0 +1,148 @@
+import re
+from bisect import bisect_right
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+
+BERLIN = ZoneInfo("Europe/Berlin")
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# German (Berlin open data) and English (OSM opening_hours) day names, Monday = 0
+DAYS = {
+    "mo": 0, "montag": 0,
+    "di": 1, "dienstag": 1, "tu": 1,
+    "mi": 2, "mittwoch": 2, "we": 2,
+    "do": 3, "donnerstag": 3, "th": 3,
+    "fr": 4, "freitag": 4,
+    "sa": 5, "samstag": 5,
+    "so": 6, "sonntag": 6, "su": 6,
+}
+
+# German day-group words rewritten to plain ranges before tokenizing
+DAY_GROUPS = {
+    "werktags": "mo-sa",
+    "wochentags": "mo-fr",
+    "täglich": "mo-so",
+}
+
+ALWAYS_OPEN = {"24h", "24 h", "24/7", "durchgehend", "ohne"}
+CLOSED = {"off", "closed"}
+
+# seasonal, dated ("12.5.2020") or conditional hours can't be answered from a weekly schedule
+UNSUPPORTED = re.compile(
+    r"jan|feb|märz|maerz|apr|mai\b|juni|juli|aug|sep|okt|nov|dez|"
+    r"sommer|winter|frühling|herbst|während|bei |nur |feiertag|ph\b|"
+    r"\b\d{1,2}\.\d{1,2}\.",
+    re.IGNORECASE,
+)
+
+_DAY = r"\b(?:" + "|".join(sorted(DAYS, key=len, reverse=True)) + r")\b"
+_TIME = r"(\d{1,2})(?:[:.](\d{2}))?"
+TOKEN = re.compile(
+    rf"(?P<days>({_DAY})(?:\s*(?:-|–|bis)\s*({_DAY}))?)"
+    rf"|(?P<times>{_TIME}\s*(?:uhr|h)?\s*(?:-|–|bis)\s*{_TIME})",
+    re.IGNORECASE,
+)
+
+
+class WeeklyHours:
+    """
+    Opening hours compiled to sorted, merged (start, end) minute intervals
+    over a Monday-based week, so is_open() is a single bisect.
+    """
+
+    __slots__ = ("intervals", "_starts")
+
+    def __init__(self, intervals):
+        merged = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        self.intervals = tuple(merged)
+        self._starts = [start for start, _ in merged]
+
+    def is_open(self, when):
+        """when: datetime in local (Berlin) time"""
+        minute = when.weekday() * MINUTES_PER_DAY + when.hour * 60 + when.minute
+        i = bisect_right(self._starts, minute) - 1
+        return i >= 0 and minute < self.intervals[i][1]
+
+
+def parse_opening_hours(text):
+    """
+    Compile a free-text schedule such as "Mo-Sa 07:00-22:00\\nSo 10:00-22:00"
+    or "Mo-Fr 7-20.30h". Returns None when the text can't be interpreted.
+    """
+    if not text or not isinstance(text, str):
+        return None
+
+    normalized = " ".join(text.split()).strip().lower()
+    if normalized in ALWAYS_OPEN:
+        return WeeklyHours([(0, MINUTES_PER_WEEK)])
+    if normalized in CLOSED:
+        return WeeklyHours([])
+    if UNSUPPORTED.search(normalized):
+        return None
+    for word, days_range in DAY_GROUPS.items():
+        normalized = normalized.replace(word, days_range)
+
+    intervals = []
+    days = set()
+    days_used = False
+
+    for match in TOKEN.finditer(normalized):
+        if match.group("days"):
+            # a day token after times starts a new rule ("Mo-Fr 9-18h, Sa 9-14h")
+            if days_used:
+                days, days_used = set(), False
+            first = DAYS[match.group(2)]
+            last = DAYS[match.group(3)] if match.group(3) else first
+            day = first
+            while True:
+                days.add(day)
+                if day == last:
+                    break
+                day = (day + 1) % 7
+            continue
+
+        h1, m1, h2, m2 = match.group(5, 6, 7, 8)
+        start = int(h1) * 60 + int(m1 or 0)
+        end = int(h2) * 60 + int(m2 or 0)
+        if start > MINUTES_PER_DAY or end > MINUTES_PER_DAY:
+            return None
+        if end <= start:
+            # past midnight
+            end += MINUTES_PER_DAY
+
+        for day in (days or range(7)):
+            week_start = day * MINUTES_PER_DAY + start
+            week_end = day * MINUTES_PER_DAY + end
+            if week_end > MINUTES_PER_WEEK:
+                # Sunday night wraps to Monday morning
+                intervals.append((0, week_end - MINUTES_PER_WEEK))
+                week_end = MINUTES_PER_WEEK
+            intervals.append((week_start, week_end))
+        days_used = True
+
+    if not intervals:
+        return None
+    return WeeklyHours(intervals)
+
+
+def parse_open_filter(open_at=None, open_now=False):
+    """
+    Resolve the open_at / open_now request parameters to a local Berlin datetime.
+    Returns None when no filter was requested; raises ValueError on a bad open_at.
+    """
+    if open_at:
+        when = datetime.fromisoformat(open_at)
+        if when.tzinfo is None:
+            return when
+        return when.astimezone(BERLIN)
+    if open_now is True or str(open_now).lower() == "true":
+        return datetime.now(BERLIN)
+    return None
@@ -0,0 +1,65 @@
+import heapq
+import math
+
+
+class KDTree:
+    """
+    Static 2-d tree over planar (x, y) points in a metric CRS.
+    Built once per dataset load; nearest() answers k-NN queries in O(log n).
+    """
+
+    def __init__(self, points):
+        # points: list of (x, y, item)
+        self._root = self._build(list(points), depth=0)
+
+    def _build(self, points, depth):
+        if not points:
+            return None
+        axis = depth % 2
+        points.sort(key=lambda p: p[axis])
+        mid = len(points) // 2
+        return (
+            points[mid],
+            axis,
+            self._build(points[:mid], depth + 1),
+            self._build(points[mid + 1:], depth + 1),
+        )
+
+    def nearest(self, x, y, k=1, predicate=None):
+        """
+        Return up to k (distance, item) tuples, closest first.
+        Items failing the optional predicate are skipped during the search.
+        """
+        if k <= 0 or self._root is None:
+            return []
+
+        # max-heap of (-distance, tiebreak, item)
+        best = []
+        counter = 0
+        # (node, distance from the query to the splitting plane that led here)
+        stack = [(self._root, 0.0)]
+
+        while stack:
+            node, plane_dist = stack.pop()
+            if node is None:
+                continue
+            # prune subtrees that cannot beat the current k-th best
+            if len(best) == k and plane_dist >= -best[0][0]:
+                continue
+            (px, py, item), axis, left, right = node
+
+            if predicate is None or predicate(item):
+                dist = math.hypot(px - x, py - y)
+                if len(best) < k:
+                    heapq.heappush(best, (-dist, counter, item))
+                    counter += 1
+                elif dist < -best[0][0]:
+                    heapq.heapreplace(best, (-dist, counter, item))
+                    counter += 1
+
+            diff = (x - px) if axis == 0 else (y - py)
+            near, far = (left, right) if diff < 0 else (right, left)
+            stack.append((far, abs(diff)))
+            stack.append((near, 0.0))
+
+        return [(-d, item) for d, _, item in sorted(best, key=lambda b: (-b[0], b[1]))]
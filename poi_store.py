@@ -0,0 +1,156 @@
+import json
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from geoalchemy2 import Geography
+from sqlalchemy import cast, func, select
+from extensions import db
+from models import Poi
+from datasets import POI_TYPES, REGIONS, load_dataset
+
+
+COPY_COLUMNS = (
+    "region", "source_id", "poi_type", "name", "district", "wheelchair", "barrier_reduced",
+    "changing_table", "spaces", "opening_hours", "properties", "geom",
+)
+
+
+def _yes(value):
+    """'ja'/'yes' -> True, 'nein'/'no' -> False, anything else -> None"""
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value in ("ja", "yes"):
+            return True
+        if value in ("nein", "no"):
+            return False
+    return None
+
+
+def poi_row(region, poi_type, feature):
+    """Map a (WGS84) dataset feature to the typed poi columns, in COPY_COLUMNS order"""
+    props = feature.get("properties", {})
+    tags = props.get("tags") or {}
+    lon, lat = feature["geometry"]["coordinates"]
+
+    if poi_type == "toilet":
+        typed = (
+            props.get("standort"), props.get("bezirk"), _yes(props.get("barrierefrei")),
+            _yes(props.get("barrierearm")), _yes(props.get("wickeltisch")), None,
+            props.get("oeffnungszeiten"),
+        )
+    elif poi_type == "parking":
+        typed = (
+            props.get("standort"), props.get("bezirk"), True, None, None,
+            props.get("anzahl"), props.get("bemerkung"),
+        )
+    else:
+        typed = (
+            tags.get("name"), tags.get("addr:suburb"), _yes(props.get("wheelchair")),
+            None, None, None, tags.get("opening_hours"),
+        )
+
+    return (
+        region, str(feature.get("id")), poi_type, *typed,
+        json.dumps(props, ensure_ascii=False),
+        f"SRID=4326;POINT({lon} {lat})",
+    )
+
+
+def load_pois(base):
+    """Replace the poi table with every region's Datapoints/ files using COPY; returns rows per (region, type)"""
+    counts = {}
+    connection = db.engine.raw_connection()
+    try:
+        # psycopg 3 connection underneath SQLAlchemy's pool wrapper
+        with connection.driver_connection.cursor() as cursor:
+            cursor.execute("TRUNCATE poi RESTART IDENTITY")
+            columns = ", ".join(COPY_COLUMNS)
+            with cursor.copy(f"COPY poi ({columns}) FROM STDIN") as copy:
+                for region in REGIONS:
+                    for poi_type in POI_TYPES:
+                        dataset = load_dataset(base, poi_type, region)
+                        if not dataset:
+                            continue
+                        for feature in dataset.features:
+                            copy.write_row(poi_row(region, poi_type, feature))
+                        counts[(region, poi_type)] = len(dataset.features)
+        connection.commit()
+    finally:
+        connection.close()
+    return counts
+
+
+@click.command("load-pois")
+@with_appcontext
+def load_pois_command():
+    """Bulk-load Datapoints/*.json into the PostGIS poi table"""
+    counts = load_pois(current_app.root_path)
+    for (region, poi_type), count in counts.items():
+        click.echo(f"{count} {poi_type} rows loaded for {region}")
+
+
+# plain "::geography" so the planner matches the ix_poi_geog expression index
+GEOGRAPHY = Geography(geometry_type=None, srid=-1)
+
+
+def _feature_query(poi_types, *extra_columns):
+    return select(
+        Poi.source_id, Poi.poi_type, Poi.properties,
+        func.ST_X(Poi.geom), func.ST_Y(Poi.geom), *extra_columns,
+    ).where(Poi.poi_type.in_(poi_types))
+
+
+def _to_features(rows):
+    features = []
+    for row in rows:
+        source_id, poi_type, properties, lon, lat, *extra = row
+        properties = dict(properties, poi_type=poi_type)
+        if extra:
+            properties["distance"] = round(extra[0], 1)
+        features.append({
+            "type": "Feature",
+            "id": source_id,
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": properties,
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+def bbox_query(min_lon, min_lat, max_lon, max_lat, poi_types):
+    envelope = func.ST_MakeEnvelope(min_lon, min_lat, max_lon, max_lat, 4326)
+    return _feature_query(poi_types).where(Poi.geom.intersects(envelope))
+
+
+def _within_query(target, distance_m, poi_types):
+    """POIs within distance_m metres of a geography expression, closest first"""
+    geog = cast(Poi.geom, GEOGRAPHY)
+    distance = func.ST_Distance(geog, target)
+    return (
+        _feature_query(poi_types, distance)
+        .where(func.ST_DWithin(geog, target, distance_m))
+        .order_by(distance)
+    )
+
+
+def radius_query(lon, lat, radius, poi_types):
+    origin = cast(func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326), GEOGRAPHY)
+    return _within_query(origin, radius, poi_types)
+
+
+def corridor_query(line, width, poi_types):
+    corridor = cast(func.ST_SetSRID(func.ST_GeomFromGeoJSON(json.dumps(line)), 4326), GEOGRAPHY)
+    return _within_query(corridor, width, poi_types)
+
+
+def pois_in_bbox(min_lon, min_lat, max_lon, max_lat, poi_types):
+    return _to_features(db.session.execute(bbox_query(min_lon, min_lat, max_lon, max_lat, poi_types)))
+
+
+def pois_within_radius(lon, lat, radius, poi_types):
+    """POIs within radius metres of a point, closest first"""
+    return _to_features(db.session.execute(radius_query(lon, lat, radius, poi_types)))
+
+
+def pois_along_corridor(line, width, poi_types):
+    """POIs within width metres of a GeoJSON LineString (e.g. a plan-route geometry)"""
+    return _to_features(db.session.execute(corridor_query(line, width, poi_types)))
@@ -0,0 +1,180 @@
+import math
+import threading
+from collections import OrderedDict, namedtuple
+
+
+# tolerance in metres or a map zoom level to derive it from (both None = keep
+# every vertex), precision in decimal places (None = full float),
+# fmt "geojson" or "polyline"
+Compaction = namedtuple("Compaction", ["tolerance", "zoom", "precision", "fmt"])
+
+FORMATS = ("geojson", "polyline")
+DEFAULT_POLYLINE_PRECISION = 5
+
+# metres per degree of latitude / of longitude at the equator
+M_PER_DEG_LAT = 110_540
+M_PER_DEG_LON = 111_320
+
+
+def zoom_tolerance(zoom, lat):
+    """Ground size of one web-mercator pixel at this zoom and latitude, in metres"""
+    return 156_543.03392 * math.cos(math.radians(lat)) / (2 ** zoom)
+
+
+def simplify(coords, tolerance):
+    """
+    Douglas-Peucker on [lon, lat] coordinates with a tolerance in metres,
+    using a local equirectangular projection (fine at route scale).
+    """
+    if tolerance <= 0 or len(coords) < 3:
+        return list(coords)
+
+    kx = M_PER_DEG_LON * math.cos(math.radians(coords[0][1]))
+    ky = M_PER_DEG_LAT
+    points = [(lon * kx, lat * ky) for lon, lat in coords]
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        ax, ay = points[first]
+        bx, by = points[last]
+        dx, dy = bx - ax, by - ay
+        length = math.hypot(dx, dy)
+
+        max_dist, index = 0.0, None
+        for i in range(first + 1, last):
+            px, py = points[i]
+            if length == 0:
+                dist = math.hypot(px - ax, py - ay)
+            else:
+                dist = abs(dy * px - dx * py + bx * ay - by * ax) / length
+            if dist > max_dist:
+                max_dist, index = dist, i
+
+        if index is not None and max_dist > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+
+    return [c for c, kept in zip(coords, keep) if kept]
+
+
+def quantize(coords, precision):
+    """
+    Round coordinates and drop vertices that collapse onto their predecessor.
+    A line keeps at least two positions (GeoJSON requires it), even if both
+    round to the same point.
+    """
+    rounded = []
+    for lon, lat in coords:
+        point = [round(lon, precision), round(lat, precision)]
+        if not rounded or point != rounded[-1]:
+            rounded.append(point)
+    if len(rounded) == 1 and len(coords) > 1:
+        rounded.append(list(rounded[0]))
+    return rounded
+
+
+def encode_polyline(coords, precision=DEFAULT_POLYLINE_PRECISION):
+    """Google encoded polyline of [lon, lat] coordinates (encoded lat first, as the format expects)"""
+    factor = 10 ** precision
+    chunks = []
+    prev_lat = prev_lon = 0
+
+    for lon, lat in coords:
+        lat_i, lon_i = round(lat * factor), round(lon * factor)
+        for delta in (lat_i - prev_lat, lon_i - prev_lon):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+                value >>= 5
+            chunks.append(chr(value + 63))
+        prev_lat, prev_lon = lat_i, lon_i
+
+    return "".join(chunks)
+
+
+def compact_geometry(geometry, compaction):
+    """
+    Apply a Compaction to a GeoJSON LineString. Returns a LineString, or for
+    the polyline format {"type": "Polyline", "polyline", "precision"}.
+    """
+    if not geometry or geometry.get("type") != "LineString":
+        return geometry
+
+    coords = geometry["coordinates"]
+    tolerance = compaction.tolerance
+    if tolerance is None and compaction.zoom is not None and coords:
+        tolerance = zoom_tolerance(compaction.zoom, coords[0][1])
+    if tolerance:
+        coords = simplify(coords, tolerance)
+
+    if compaction.fmt == "polyline":
+        precision = DEFAULT_POLYLINE_PRECISION if compaction.precision is None else compaction.precision
+        return {
+            "type": "Polyline",
+            "polyline": encode_polyline(coords, precision),
+            "precision": precision,
+        }
+
+    if compaction.precision is not None:
+        coords = quantize(coords, compaction.precision)
+    return {"type": "LineString", "coordinates": coords}
+
+
+class CachedRoute:
+    """A full route Feature plus its most recently requested compacted variants"""
+
+    def __init__(self, route, max_variants=8):
+        self.route = route
+        self.max_variants = max_variants
+        self.variants = OrderedDict()
+        self._lock = threading.Lock()
+
+    def variant(self, compaction=None):
+        if compaction is None:
+            return self.route
+        with self._lock:
+            compacted = self.variants.get(compaction)
+            if compacted is not None:
+                self.variants.move_to_end(compaction)
+                return compacted
+
+        compacted = {
+            **self.route,
+            "geometry": compact_geometry(self.route["geometry"], compaction),
+        }
+        with self._lock:
+            self.variants[compaction] = compacted
+            self.variants.move_to_end(compaction)
+            while len(self.variants) > self.max_variants:
+                self.variants.popitem(last=False)
+        return compacted
+
+
+class RouteCache:
+    """Bounded LRU of routes keyed by (start, destination, profile)"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, route):
+        with self._lock:
+            entry = CachedRoute(route)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return entry
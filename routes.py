@@ -2,16 +2,44 @@ from flask import Blueprint, request, jsonify, abort, current_app
 from extensions import db   
 from models import User, Favorite
 from schemas import user_schema, users_schema, favorite_schema, favorites_schema
-from pyproj import Transformer
+from datasets import POI_TYPES, REGIONS, DEFAULT_REGION, load_dataset, regions_at, regions_in_bbox
+from opening_hours import parse_open_filter
+from poi_store import pois_in_bbox, pois_within_radius, pois_along_corridor
+from route_geometry import Compaction, FORMATS, RouteCache, compact_geometry
+from user_cache import ProfileCache, user_profile
+from autocomplete import RecentMisses, normalize, remember_geocode, suggest
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-import json
-import os
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
 import requests
 
 
-TRANSFORMER_25833_TO_4326 = Transformer.from_crs(
-    "EPSG:25833", "EPSG:4326", always_xy=True
-)
+MAX_NEAREST_K = 50
+WALKING_RERANK_FACTOR = 3
+# public OSRM demo server rejects larger tables
+MAX_OSRM_TABLE_SIZE = 100
+MAX_POI_RADIUS = 5000
+DEFAULT_CORRIDOR_WIDTH = 100
+MAX_SIMPLIFY_TOLERANCE = 1000
+MAX_ZOOM = 22
+MAX_PRECISION = 10
+MAX_AUTOCOMPLETE_LIMIT = 10
+# shorter prefixes match too much of the index to be useful suggestions
+MIN_AUTOCOMPLETE_LENGTH = 3
+MAX_BATCH_PAIRS = 25
+# distinct addresses geocoded per batch; at one Nominatim call per second this bounds the wait
+MAX_BATCH_ADDRESSES = 10
+# Nominatim usage policy: at most one request per second
+NOMINATIM_MIN_INTERVAL = 1.0
+MAX_ROUTING_WORKERS = 4
+
+# full OSRM routes with their compacted variants, shared by plan-route requests
+ROUTE_CACHE = RouteCache(maxsize=256)
+# serialized profiles of recently authenticated users, saves the User query on JWT endpoints
+PROFILE_CACHE = ProfileCache(maxsize=1024, ttl=300)
+# (region, query) pairs Nominatim just had no answer for, so repeated keystrokes stay local
+AUTOCOMPLETE_MISSES = RecentMisses(maxsize=1024, ttl=60)
 
 api_bp = Blueprint("api", __name__)
 data_bp = Blueprint("data", __name__)
@@ -25,16 +53,17 @@ def list_users():
 @api_bp.get("/me")
 @jwt_required()
 def me():
-    user_id = get_jwt_identity()
-    user = User.query.get_or_404(user_id)
+    return jsonify(current_user_profile()), 200
 
-    return jsonify(
-        id=user_id,
-        email=user.email,
-        name=user.name,
-        needs=user.needs,
-        created_at=user.created_at.isoformat() if user.created_at else None,
-    ), 200
+
+def current_user_profile():
+    """Profile of the JWT's user, served from PROFILE_CACHE when possible"""
+    user_id = int(get_jwt_identity())
+    profile = PROFILE_CACHE.get(user_id)
+    if profile is None:
+        user = User.query.get_or_404(user_id)
+        profile = PROFILE_CACHE.put(user_id, user_profile(user))
+    return profile
 
 # GET /api/users/<id>
 @api_bp.get("/users/<int:user_id>")
@@ -91,6 +120,7 @@ def update_user(user_id):
         user.needs = data["needs"]
     
     db.session.commit()
+    PROFILE_CACHE.invalidate(user_id)
     return user_schema.jsonify(user), 200
 
 # DELETE /api/users/<id>
@@ -99,12 +129,13 @@ def delete_user(user_id):
     user = User.query.get_or_404(user_id)
     db.session.delete(user)
     db.session.commit()
+    PROFILE_CACHE.invalidate(user_id)
     return jsonify(message="deleted"), 200
 
 @api_bp.get("/users/me/favorites")
 @jwt_required()
 def my_favorites():
-    user_id = get_jwt_identity()
+    user_id = current_user_profile()["id"]
     favs = Favorite.query.filter_by(user_id=user_id).order_by(Favorite.id.desc()).all()
     return favorites_schema.jsonify(favs), 200
 
@@ -112,7 +143,7 @@ def my_favorites():
 @api_bp.post("/users/me/favorites")
 @jwt_required()
 def add_my_favorite():
-    user_id = get_jwt_identity()
+    user_id = current_user_profile()["id"]
     data = request.get_json(force=True, silent=True) or {}
     route_data = data.get("route_data")
 
@@ -146,17 +177,10 @@ def login():
     if not user or not user.check_password(password):
         abort(401, description="invalid credentials")
     
-    access_token = create_access_token(identity=user.id)
+    # PyJWT requires a string subject
+    access_token = create_access_token(identity=str(user.id))
 
-    needs = user.needs
-
-    user_payload = {
-        "id": user.id,
-        "email": user.email,
-        "name": user.name,
-        "needs": needs,
-        "created_at": user.created_at.isoformat() if user.created_at else None,
-    }
+    user_payload = PROFILE_CACHE.put(user.id, user_profile(user))
 
     return jsonify(
         message="login successful", 
@@ -166,67 +190,201 @@ def login():
 
 @data_bp.get("/toilets")
 def get_toilets():
-    base = current_app.root_path
-    path = os.path.join(base, "Datapoints", "toilets.json")
-    if not os.path.exists(path):
-        abort(404, description="toilets dataset missing")
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    for feature in data.get("features", []):
-        geom = feature.get("geometry")
-        if not geom or geom.get("type") != "Point":
-            continue
-        x,y = geom["coordinates"] 
-        lon, lat = TRANSFORMER_25833_TO_4326.transform(x, y)
-        geom["coordinates"] = [lon, lat]
-
-    return jsonify(data), 200
+    return dataset_response("toilet", "toilets dataset missing")
 
 @data_bp.get("/accessible_parking")
 def get_accessible_parking():
-    base = current_app.root_path
-    path = os.path.join(base, "Datapoints", "accessible_parking.json")
-    if not os.path.exists(path):
-        abort(404, description="parking dataset missing")
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    for feature in data.get("features", []):
-        geom = feature.get("geometry")
-        if not geom or geom.get("type") != "Point":
-            continue
-        x,y = geom["coordinates"] 
-        lon, lat = TRANSFORMER_25833_TO_4326.transform(x, y)
-        geom["coordinates"] = [lon, lat]
-
-    return jsonify(data), 200
+    return dataset_response("parking", "parking dataset missing")
 
 
 @data_bp.get("/elevators")
 def get_elevators():
-    base = current_app.root_path
-    path = os.path.join(base, "Datapoints", "elevators.json")
-    if not os.path.exists(path):
-        abort(404, description="elevators dataset missing")
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    for feature in data.get("features", []):
-        geom = feature.get("geometry")
-        if not geom or geom.get("type") != "Point":
-            continue
-        x,y = geom["coordinates"] 
-        lon, lat = TRANSFORMER_25833_TO_4326.transform(x, y)
-        geom["coordinates"] = [lon, lat]
+    return dataset_response("elevator", "elevators dataset missing")
+
+
+def dataset_response(poi_type, missing_message):
+    """
+    Serve a region's cached dataset (?region=, default berlin),
+    filtered by ?open_at= / ?open_now=true when given
+    """
+    when = requested_open_time(request.args)
+    region = request.args.get("region", DEFAULT_REGION)
+    if region not in REGIONS:
+        abort(404, description=f"unknown region: {region}")
+    dataset = load_dataset(current_app.root_path, poi_type, region)
+    if not dataset:
+        abort(404, description=missing_message)
+
+    if when is None:
+        return jsonify(dataset.collection), 200
+
+    features = dataset.open_features(when)
+    filtered = {**dataset.collection, "features": features}
+    # the WFS counters describe the unfiltered file
+    for counter in ("totalFeatures", "numberMatched", "numberReturned"):
+        if counter in filtered:
+            filtered[counter] = len(features)
+    return jsonify(filtered), 200
+
+
+def requested_open_time(source):
+    """open_at / open_now from query args or a JSON body; None when not filtering"""
+    try:
+        return parse_open_filter(source.get("open_at"), source.get("open_now", False))
+    except (TypeError, ValueError):
+        abort(400, description="open_at must be an ISO 8601 datetime")
+
+
+@data_bp.get("/pois/nearest")
+def nearest_pois():
+    """
+    k-nearest POIs around a point
+    Query: lon, lat, type (toilet|elevator|parking, comma separated, default all),
+           k (default 5, max 50), walking=true to re-rank by OSRM walking distance,
+           open_at=<ISO datetime> / open_now=true to skip closed POIs
+    Output: FeatureCollection sorted by distance
+    """
+    lon = request.args.get("lon", type=float)
+    lat = request.args.get("lat", type=float)
+    if lon is None or lat is None:
+        abort(400, description="lon and lat required")
+
+    poi_types = requested_poi_types(request.args.get("type"))
+
+    k = request.args.get("k", default=5, type=int)
+    if k < 1 or k > MAX_NEAREST_K:
+        abort(400, description=f"k must be between 1 and {MAX_NEAREST_K}")
+
+    when = requested_open_time(request.args)
+    walking = request.args.get("walking", "false").lower() == "true"
+    # straight-line order is only a proxy for walking distance, so re-rank a wider pool
+    pool = min(k * WALKING_RERANK_FACTOR, MAX_OSRM_TABLE_SIZE) if walking else k
+
+    # only the regions containing the point are loaded
+    candidates = []
+    for region in regions_at(lon, lat):
+        for poi_type in poi_types:
+            dataset = load_dataset(current_app.root_path, poi_type, region)
+            if dataset:
+                candidates.extend(dataset.nearest(lon, lat, pool, when))
+    candidates.sort(key=lambda c: c[0])
+    candidates = candidates[:pool]
+
+    features = []
+    for dist, feature in candidates:
+        properties = dict(feature["properties"], distance=round(dist, 1))
+        features.append({**feature, "properties": properties})
+
+    if walking and features:
+        table = osrm_walking_table(
+            [lon, lat], [f["geometry"]["coordinates"] for f in features]
+        )
+        if table:
+            for feature, (distance, duration) in zip(features, table):
+                feature["properties"]["walking_distance"] = distance
+                feature["properties"]["walking_duration"] = duration
+            # unreachable candidates go last
+            features.sort(key=lambda f: (
+                f["properties"]["walking_distance"] is None,
+                f["properties"]["walking_distance"] or 0,
+            ))
+
+    return jsonify({"type": "FeatureCollection", "features": features[:k]}), 200
+
+
+def requested_poi_types(types):
+    """Comma separated type filter; all datasets when empty"""
+    poi_types = types.split(",") if types else list(POI_TYPES)
+    unknown = [t for t in poi_types if t not in POI_TYPES]
+    if unknown:
+        abort(400, description=f"unknown type: {', '.join(unknown)}")
+    return poi_types
+
+
+@data_bp.get("/pois")
+def query_pois():
+    """
+    Spatial POI query answered by PostGIS (POI_BACKEND=postgis)
+    Query: bbox=minLon,minLat,maxLon,maxLat  or  lon, lat, radius (metres, max 5000);
+           type (toilet|elevator|parking, comma separated, default all)
+    Output: FeatureCollection (radius results sorted by distance)
+    """
+    require_poi_database()
+    poi_types = requested_poi_types(request.args.get("type"))
+
+    bbox = request.args.get("bbox")
+    if bbox:
+        try:
+            min_lon, min_lat, max_lon, max_lat = (float(v) for v in bbox.split(","))
+        except ValueError:
+            abort(400, description="bbox must be minLon,minLat,maxLon,maxLat")
+        return jsonify(pois_in_bbox(min_lon, min_lat, max_lon, max_lat, poi_types)), 200
+
+    lon = request.args.get("lon", type=float)
+    lat = request.args.get("lat", type=float)
+    radius = request.args.get("radius", type=float)
+    if lon is None or lat is None or radius is None:
+        abort(400, description="bbox or lon, lat and radius required")
+    if radius <= 0 or radius > MAX_POI_RADIUS:
+        abort(400, description=f"radius must be between 0 and {MAX_POI_RADIUS} metres")
+    return jsonify(pois_within_radius(lon, lat, radius, poi_types)), 200
+
+
+@data_bp.post("/pois/corridor")
+def query_pois_corridor():
+    """
+    POIs along a route, answered by PostGIS (POI_BACKEND=postgis)
+    Input: { route: GeoJSON LineString or Feature (as returned by /plan-route), width: metres, type }
+    Output: FeatureCollection sorted by distance to the route
+    """
+    require_poi_database()
+    data = request.get_json(force=True, silent=True) or {}
+    poi_types = requested_poi_types(data.get("type"))
+    width = data.get("width", DEFAULT_CORRIDOR_WIDTH)
+
+    line = data.get("route")
+    if isinstance(line, dict) and line.get("type") == "Feature":
+        line = line.get("geometry")
+    if not isinstance(line, dict) or line.get("type") != "LineString":
+        abort(400, description="route must be a GeoJSON LineString")
+    coords = line_coordinates(line.get("coordinates"))
+    if coords is None:
+        abort(400, description="route coordinates must be at least two [lon, lat] positions")
+    if not isinstance(width, (int, float)) or width <= 0 or width > MAX_POI_RADIUS:
+        abort(400, description=f"width must be between 0 and {MAX_POI_RADIUS} metres")
+
+    line = {"type": "LineString", "coordinates": coords}
+    return jsonify(pois_along_corridor(line, width, poi_types)), 200
+
+
+def line_coordinates(coords):
+    """[[lon, lat], ...] with at least two valid WGS84 positions, else None"""
+    if not isinstance(coords, list) or len(coords) < 2:
+        return None
+    positions = []
+    for position in coords:
+        if not isinstance(position, list) or len(position) < 2:
+            return None
+        lon, lat = position[:2]
+        if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (lon, lat)):
+            return None
+        if not (-180 <= lon <= 180 and -90 <= lat <= 90):
+            return None
+        positions.append([lon, lat])
+    return positions
+
+
+def require_poi_database():
+    if current_app.config.get("POI_BACKEND") != "postgis":
+        abort(404, description="POI database backend not enabled")
 
-    return jsonify(data), 200
 
 @api_bp.post("/plan-route")
 def plan_route():
     """
     MVP: One endpoint for everything
-    Input: { start: "address", destination: "address", show_toilets, show_elevators, show_parking }
+    Input: { start: "address", destination: "address", show_toilets, show_elevators, show_parking,
+             open_at / open_now, simplify (metres) / zoom, precision, format (geojson|polyline) }
     Output: { route, pois, start, destination }
     """
     data = request.get_json(force=True, silent=True) or {}
@@ -235,6 +393,8 @@ def plan_route():
     show_toilets = data.get("show_toilets", True)
     show_elevators = data.get("show_elevators", True)
     show_parking = data.get("show_parking", True)
+    when = requested_open_time(data)
+    compaction = requested_compaction(data)
     
     if not start_text or not dest_text:
         abort(400, description="start and destination required")
@@ -250,12 +410,15 @@ def plan_route():
         return jsonify(error="Destination address not found"), 404
     
     # Step 3: Calculate route (foot only for MVP)
-    route = calculate_osrm_route(start_coords, dest_coords, profile='foot')
+    route = calculate_osrm_route(start_coords, dest_coords, profile='foot', compaction=compaction)
     if not route:
         return jsonify(error="Could not calculate route"), 500
     
-    # Step 4: Load filtered POIs
-    pois = load_filtered_pois(show_toilets, show_elevators, show_parking)
+    # Step 4: Load filtered POIs of the regions the trip touches
+    pois = load_filtered_pois(
+        show_toilets, show_elevators, show_parking, when,
+        regions_along([start_coords, dest_coords])
+    )
     
     return jsonify({
         "route": route,
@@ -265,6 +428,112 @@ def plan_route():
     }), 200
 
 
+@api_bp.post("/plan-route/batch")
+def plan_route_batch():
+    """
+    Batch variant of /plan-route for many start/destination pairs
+    Input: { pairs: [{start, destination}, ...], show_toilets, show_elevators, show_parking,
+             open_at / open_now, simplify / zoom, precision, format }
+    Output: { results: [{ route, start, destination } | { error }, ...], pois }
+    """
+    data = request.get_json(force=True, silent=True) or {}
+    pairs = data.get("pairs")
+    show_toilets = data.get("show_toilets", True)
+    show_elevators = data.get("show_elevators", True)
+    show_parking = data.get("show_parking", True)
+    when = requested_open_time(data)
+    compaction = requested_compaction(data)
+
+    if not isinstance(pairs, list) or not pairs:
+        abort(400, description="pairs must be a non-empty list")
+    if len(pairs) > MAX_BATCH_PAIRS:
+        abort(400, description=f"at most {MAX_BATCH_PAIRS} pairs per batch")
+    for pair in pairs:
+        if not isinstance(pair, dict) or not pair.get("start") or not pair.get("destination"):
+            abort(400, description="every pair needs start and destination")
+
+    addresses = {}
+    for pair in pairs:
+        for text in (pair["start"], pair["destination"]):
+            addresses.setdefault(_address_key(text), text)
+    if len(addresses) > MAX_BATCH_ADDRESSES:
+        abort(400, description=f"at most {MAX_BATCH_ADDRESSES} distinct addresses per batch")
+
+    # Step 1: Geocode each distinct address once.
+    # Sequential on purpose: geocode_address waits out Nominatim's rate limit.
+    coords_by_address = {key: geocode_address(text) for key, text in addresses.items()}
+
+    # Step 2: Route each distinct coordinate pair once, with bounded fan-out
+    legs = set()
+    for pair in pairs:
+        start_coords = coords_by_address[_address_key(pair["start"])]
+        dest_coords = coords_by_address[_address_key(pair["destination"])]
+        if start_coords and dest_coords:
+            legs.add((tuple(start_coords), tuple(dest_coords)))
+
+    routes_by_leg = {}
+    if legs:
+        with ThreadPoolExecutor(max_workers=min(MAX_ROUTING_WORKERS, len(legs))) as pool:
+            futures = {
+                leg: pool.submit(calculate_osrm_route, list(leg[0]), list(leg[1]), 'foot', compaction)
+                for leg in legs
+            }
+            routes_by_leg = {leg: future.result() for leg, future in futures.items()}
+
+    # Step 3: Assemble per-pair results in request order
+    results = []
+    for pair in pairs:
+        start_text, dest_text = pair["start"], pair["destination"]
+        start_coords = coords_by_address[_address_key(start_text)]
+        dest_coords = coords_by_address[_address_key(dest_text)]
+
+        if not start_coords:
+            results.append({"error": "Start address not found", "status": 404})
+            continue
+        if not dest_coords:
+            results.append({"error": "Destination address not found", "status": 404})
+            continue
+
+        route = routes_by_leg.get((tuple(start_coords), tuple(dest_coords)))
+        if not route:
+            results.append({"error": "Could not calculate route", "status": 500})
+            continue
+
+        results.append({
+            "route": route,
+            "start": {"coords": start_coords, "address": start_text},
+            "destination": {"coords": dest_coords, "address": dest_text},
+            "status": 200
+        })
+
+    # Step 4: POIs are the same for every pair, so they are sent once
+    pois = load_filtered_pois(
+        show_toilets, show_elevators, show_parking, when,
+        regions_along([coords for coords in coords_by_address.values() if coords])
+    )
+
+    return jsonify({"results": results, "pois": pois}), 200
+
+
+def _address_key(text):
+    """Normalize an address so trivially different spellings geocode once"""
+    return " ".join(str(text).split()).casefold()
+
+
+_nominatim_lock = threading.Lock()
+_nominatim_last_call = 0.0
+
+
+def wait_for_nominatim():
+    """Block until NOMINATIM_MIN_INTERVAL has passed since this process's last Nominatim call"""
+    global _nominatim_last_call
+    with _nominatim_lock:
+        delay = _nominatim_last_call + NOMINATIM_MIN_INTERVAL - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        _nominatim_last_call = time.monotonic()
+
+
 def geocode_address(address):
     """Convert address string to [lon, lat] coordinates"""
     url = "https://nominatim.openstreetmap.org/search"
@@ -277,20 +546,62 @@ def geocode_address(address):
     headers = {"User-Agent": "AccessNow+ App"}
     
     try:
+        wait_for_nominatim()
         response = requests.get(url, params=params, headers=headers, timeout=10)
         response.raise_for_status()
         results = response.json()
         
         if results:
-            return [float(results[0]['lon']), float(results[0]['lat'])]
+            lon, lat = float(results[0]['lon']), float(results[0]['lat'])
+            remember_geocode(results[0].get('display_name') or address, lon, lat)
+            return [lon, lat]
         return None
     except Exception as e:
         print(f"Geocoding error: {e}")
         return None
 
 
-def calculate_osrm_route(start, destination, profile='foot'):
-    """Calculate route using OSRM and return GeoJSON Feature"""
+def requested_compaction(source):
+    """
+    simplify / zoom / precision / format from query args or a JSON body;
+    None when the full geometry was asked for
+    """
+    tolerance = source.get("simplify")
+    zoom = source.get("zoom")
+    precision = source.get("precision")
+    fmt = source.get("format", "geojson")
+
+    try:
+        tolerance = None if tolerance is None else float(tolerance)
+        zoom = None if zoom is None else int(zoom)
+        precision = None if precision is None else int(precision)
+    except (TypeError, ValueError):
+        abort(400, description="simplify, zoom and precision must be numbers")
+
+    if tolerance is not None and not 0 <= tolerance <= MAX_SIMPLIFY_TOLERANCE:
+        abort(400, description=f"simplify must be between 0 and {MAX_SIMPLIFY_TOLERANCE} metres")
+    if zoom is not None and not 0 <= zoom <= MAX_ZOOM:
+        abort(400, description=f"zoom must be between 0 and {MAX_ZOOM}")
+    if precision is not None and not 0 <= precision <= MAX_PRECISION:
+        abort(400, description=f"precision must be between 0 and {MAX_PRECISION}")
+    if fmt not in FORMATS:
+        abort(400, description=f"format must be one of: {', '.join(FORMATS)}")
+
+    if tolerance is None and zoom is None and precision is None and fmt == "geojson":
+        return None
+    return Compaction(tolerance, zoom, precision, fmt)
+
+
+def calculate_osrm_route(start, destination, profile='foot', compaction=None):
+    """
+    Calculate route using OSRM and return GeoJSON Feature.
+    Routes are cached with their compacted variants, so repeated trips cost no OSRM call.
+    """
+    key = (tuple(start), tuple(destination), profile)
+    cached = ROUTE_CACHE.get(key)
+    if cached:
+        return cached.variant(compaction)
+
     url = f"http://router.project-osrm.org/route/v1/{profile}/{start[0]},{start[1]};{destination[0]},{destination[1]}"
     params = {
         "overview": "full",
@@ -304,7 +615,7 @@ def calculate_osrm_route(start, destination, profile='foot'):
         
         if data.get('routes'):
             route = data['routes'][0]
-            return {
+            feature = {
                 "type": "Feature",
                 "geometry": route['geometry'],
                 "properties": {
@@ -312,68 +623,71 @@ def calculate_osrm_route(start, destination, profile='foot'):
                     "duration": route['duration']   # seconds
                 }
             }
+            return ROUTE_CACHE.put(key, feature).variant(compaction)
         return None
     except Exception as e:
         print(f"Routing error: {e}")
         return None
 
-def load_filtered_pois(show_toilets, show_elevators, show_parking):
+def osrm_walking_table(origin, destinations, profile='foot'):
+    """
+    One OSRM table call from origin to all destinations.
+    Returns [(distance_m, duration_s), ...] aligned with destinations, or None on failure
+    """
+    coords = ";".join(f"{lon},{lat}" for lon, lat in [origin, *destinations])
+    url = f"http://router.project-osrm.org/table/v1/{profile}/{coords}"
+    params = {
+        "sources": "0",
+        "destinations": ";".join(str(i) for i in range(1, len(destinations) + 1)),
+        "annotations": "distance,duration"
+    }
+
+    try:
+        response = requests.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+
+        if data.get('code') == 'Ok':
+            return list(zip(data['distances'][0], data['durations'][0]))
+        return None
+    except Exception as e:
+        print(f"Routing table error: {e}")
+        return None
+
+def regions_along(coords):
+    """Regions whose bbox overlaps the bbox of the given [lon, lat] points"""
+    if not coords:
+        return []
+    lons = [c[0] for c in coords]
+    lats = [c[1] for c in coords]
+    return regions_in_bbox(min(lons), min(lats), max(lons), max(lats))
+
+def load_filtered_pois(show_toilets, show_elevators, show_parking, when=None, regions=(DEFAULT_REGION,)):
     base = current_app.root_path
     all_pois = {"type": "FeatureCollection", "features": []}
-    
-    # Toilets
-    if show_toilets:
-        toilets_path = os.path.join(base, "Datapoints", "toilets.json")
-        if os.path.exists(toilets_path):
-            with open(toilets_path, "r", encoding="utf-8") as f:
-                toilets_data = json.load(f)
-                for feature in toilets_data.get("features", []):
-                    geom = feature.get("geometry")
-                    if geom and geom.get("type") == "Point":
-                        x, y = geom["coordinates"]
-                        lon, lat = TRANSFORMER_25833_TO_4326.transform(x, y)
-                        feature["geometry"]["coordinates"] = [lon, lat]
-                        feature["properties"]["poi_type"] = "toilet"
-                        all_pois["features"].append(feature)
-    
-    # Elevators
-    if show_elevators:
-        elevators_path = os.path.join(base, "Datapoints", "elevators.json")
-        if os.path.exists(elevators_path):
-            with open(elevators_path, "r", encoding="utf-8") as f:
-                elevators_data = json.load(f)
-                for feature in elevators_data.get("features", []):
-                    geom = feature.get("geometry")
-                    if geom and geom.get("type") == "Point":
-                        x, y = geom["coordinates"]
-                        lon, lat = TRANSFORMER_25833_TO_4326.transform(x, y)
-                        feature["geometry"]["coordinates"] = [lon, lat]
-                        feature["properties"]["poi_type"] = "elevator"
-                        all_pois["features"].append(feature)
-    
-    # Accessible parking
-    if show_parking:
-        parking_path = os.path.join(base, "Datapoints", "accessible_parking.json")
-        if os.path.exists(parking_path):
-            with open(parking_path, "r", encoding="utf-8") as f:
-                parking_data = json.load(f)
-                for feature in parking_data.get("features", []):
-                    geom = feature.get("geometry")
-                    if geom and geom.get("type") == "Point":
-                        x, y = geom["coordinates"]
-                        lon, lat = TRANSFORMER_25833_TO_4326.transform(x, y)
-                        feature["geometry"]["coordinates"] = [lon, lat]
-                        feature["properties"]["poi_type"] = "parking"
-                        all_pois["features"].append(feature)
-    
+    selected = {
+        "toilet": show_toilets,
+        "elevator": show_elevators,
+        "parking": show_parking,
+    }
+
+    for poi_type, show in selected.items():
+        if not show:
+            continue
+        for region in regions:
+            dataset = load_dataset(base, poi_type, region)
+            if dataset:
+                all_pois["features"].extend(dataset.open_features(when))
+
     return all_pois
 
 @api_bp.post("/route")
 def calculate_route():
-    """Legacy route endpoint - coordinates input"""
+    """Legacy route endpoint - coordinates input, optional simplify / zoom / precision / format"""
     data = request.get_json(force=True, silent=True) or {}
     start = data.get("start")  # [lon, lat]
     destination = data.get("destination")  # [lon, lat]
+    compaction = requested_compaction(data)
     
     if not start or not destination:
         abort(400, description="start and destination required")
@@ -390,11 +704,22 @@ def calculate_route():
         response = requests.get(osrm_url, params=params, timeout=30)
         response.raise_for_status()
         route_data = response.json()
+        if compaction:
+            compact_osrm_payload(route_data, compaction)
         return jsonify(route_data), 200
     except Exception as e:
         return jsonify(error=str(e)), 500
 
 
+def compact_osrm_payload(route_data, compaction):
+    """Compact route and step geometries of a raw OSRM response in place"""
+    for route in route_data.get("routes", []):
+        route["geometry"] = compact_geometry(route.get("geometry"), compaction)
+        for leg in route.get("legs", []):
+            for step in leg.get("steps", []):
+                step["geometry"] = compact_geometry(step.get("geometry"), compaction)
+
+
 @api_bp.get("/geocode")
 def geocode():
     """Legacy geocode endpoint - query parameter"""
@@ -418,9 +743,71 @@ def geocode():
     }
     
     try:
+        wait_for_nominatim()
         response = requests.get(nominatim_url, params=params, headers=headers, timeout=10)
         response.raise_for_status()
         results = response.json()
+        for result in results:
+            remember_geocode(result['display_name'], float(result['lon']), float(result['lat']))
         return jsonify(results), 200
     except Exception as e:
-        return jsonify(error=str(e)), 500
\ No newline at end of file
+        return jsonify(error=str(e)), 500
+
+
+@api_bp.get("/autocomplete")
+def autocomplete():
+    """
+    Type-ahead suggestions from a local prefix index of dataset place names
+    and earlier geocodes; Nominatim is only asked when nothing matches.
+    Query: q (at least 3 characters), limit (default 5, max 10), region (default berlin)
+    Output: [{ label, coords: [lon, lat], source, poi_type? }]
+    """
+    query = " ".join(request.args.get("q", "").split())
+    if not query:
+        abort(400, description="query required")
+    if len(query) < MIN_AUTOCOMPLETE_LENGTH:
+        abort(400, description=f"query must be at least {MIN_AUTOCOMPLETE_LENGTH} characters")
+
+    limit = request.args.get("limit", default=5, type=int)
+    if limit < 1 or limit > MAX_AUTOCOMPLETE_LIMIT:
+        abort(400, description=f"limit must be between 1 and {MAX_AUTOCOMPLETE_LIMIT}")
+    region = request.args.get("region", DEFAULT_REGION)
+    if region not in REGIONS:
+        abort(404, description=f"unknown region: {region}")
+
+    suggestions = suggest(current_app.root_path, query, limit, region)
+    if suggestions:
+        return jsonify(suggestions), 200
+
+    miss_key = (region, normalize(query))
+    if miss_key in AUTOCOMPLETE_MISSES:
+        return jsonify([]), 200
+
+    # local miss: fall back to Nominatim, bounded to the region, and learn its answers
+    min_lon, min_lat, max_lon, max_lat = REGIONS[region].bbox
+    params = {
+        "q": query,
+        "format": "json",
+        "limit": limit,
+        "countrycodes": "de",
+        "viewbox": f"{min_lon},{max_lat},{max_lon},{min_lat}",
+        "bounded": 1
+    }
+    headers = {"User-Agent": "AccessNow+ App"}
+
+    try:
+        wait_for_nominatim()
+        response = requests.get("https://nominatim.openstreetmap.org/search", params=params, headers=headers, timeout=10)
+        response.raise_for_status()
+        results = response.json()
+    except Exception as e:
+        return jsonify(error=str(e)), 500
+
+    suggestions = []
+    for result in results:
+        lon, lat = float(result['lon']), float(result['lat'])
+        remember_geocode(result['display_name'], lon, lat)
+        suggestions.append({"label": result['display_name'], "coords": [lon, lat], "source": "nominatim"})
+    if not suggestions:
+        AUTOCOMPLETE_MISSES.add(miss_key)
+    return jsonify(suggestions), 200
\ No newline at end of file
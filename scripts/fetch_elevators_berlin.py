@@ -1,7 +1,12 @@
+import argparse
 import json
+import sys
 from pathlib import Path
 import requests
-from pyproj import Transformer
+
+# run from the repo root: python scripts/fetch_elevators_berlin.py [--region NAME]
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from datasets import REGIONS, DEFAULT_REGION, transformer
 
 OVERPASS_URLS = [
     "https://overpass.kumi.systems/api/interpreter",
@@ -11,23 +16,29 @@ OVERPASS_URLS = [
 
 QUERY = """
 [out:json][timeout:60];
-area["name"="Berlin"]["admin_level"="4"]->.berlin;
+{area}
 (
-  node["highway"="elevator"](area.berlin);
-  way["highway"="elevator"](area.berlin);
-  relation["highway"="elevator"](area.berlin);
+  node["highway"="elevator"]({scope});
+  way["highway"="elevator"]({scope});
+  relation["highway"="elevator"]({scope});
 
-  node["amenity"="elevator"](area.berlin);
-  way["amenity"="elevator"](area.berlin);
-  relation["amenity"="elevator"](area.berlin);
+  node["amenity"="elevator"]({scope});
+  way["amenity"="elevator"]({scope});
+  relation["amenity"="elevator"]({scope});
 );
 out center tags;
 """
 
-# WGS84 (lon/lat) -> UTM 33N (Berlin): EPSG:25833
-transformer = Transformer.from_crs("EPSG:4326", "EPSG:25833", always_xy=True)
+def build_query(region):
+    """Search the region's OSM boundary if it declares one, otherwise its bbox"""
+    if region.osm_area:
+        name, admin_level = region.osm_area
+        area = f'area["name"="{name}"]["admin_level"="{admin_level}"]->.region;'
+        return QUERY.format(area=area, scope="area.region")
+    min_lon, min_lat, max_lon, max_lat = region.bbox
+    return QUERY.format(area="", scope=f"{min_lat},{min_lon},{max_lat},{max_lon}")
 
-def to_feature(el):
+def to_feature(el, to_region_crs):
     # coordinates: node has lon/lat, way/relation use center
     if el["type"] == "node":
         lon, lat = el["lon"], el["lat"]
@@ -37,8 +48,8 @@ def to_feature(el):
             return None
         lon, lat = c["lon"], c["lat"]
 
-    # transform to EPSG:25833 Berlin Open Data files
-    x, y = transformer.transform(lon, lat)
+    # transform to the region's source CRS (EPSG:25833 for Berlin Open Data files)
+    x, y = to_region_crs.transform(lon, lat)
 
     tags = el.get("tags", {})
     return {
@@ -57,13 +68,21 @@ def to_feature(el):
     }
 
 def main():
+    parser = argparse.ArgumentParser(description="Fetch OSM elevators for a dataset region")
+    parser.add_argument("--region", default=DEFAULT_REGION, choices=sorted(REGIONS))
+    args = parser.parse_args()
+    region = REGIONS[args.region]
+    if "elevator" not in region.files:
+        raise SystemExit(f"Region {region.name} hat keine Aufzugsdatei registriert")
+
+    query = build_query(region)
     data = None
     last_error = None
     
     for url in OVERPASS_URLS:
         try:
             print(f"Versuche Server: {url}")
-            r = requests.post(url, data={"data": QUERY}, timeout=120)
+            r = requests.post(url, data={"data": query}, timeout=120)
             r.raise_for_status()
             data = r.json()
             print(f"Erfolgreich! Server {url} hat geantwortet.")
@@ -76,16 +95,17 @@ def main():
     if data is None:
         raise Exception(f"Alle Overpass-Server fehlgeschlagen. Letzter Fehler: {last_error}")
 
+    to_region_crs = transformer("EPSG:4326", region.crs)
     features = []
     for el in data.get("elements", []):
-        f = to_feature(el)
+        f = to_feature(el, to_region_crs)
         if f:
             features.append(f)
 
     fc = {"type": "FeatureCollection", "features": features}
 
-    out_path = Path("Datapoints/elevators.json")
-    out_path.parent.mkdir(exist_ok=True)  
+    out_path = Path(region.path(".", "elevator"))
+    out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(json.dumps(fc, ensure_ascii=False, indent=2), encoding="utf-8")
     print(f"✓ {len(features)} Aufzüge nach {out_path} geschrieben")
 
@@ -0,0 +1,39 @@
+import autocomplete
+from autocomplete import PrefixIndex
+from datasets import REGIONS, Region
+
+
+def test_prefix_search_matches_every_query_token():
+    index = PrefixIndex()
+    index.add("Bahnhof Alexanderplatz", [13.41, 52.52], "dataset", "toilet")
+    index.add("Alexanderstraße 5", [13.42, 52.52], "dataset", "toilet")
+    index.add("Zoologischer Garten", [13.33, 52.51], "dataset", "toilet")
+
+    labels = [entry[0] for _, entry in index.search("alex", 5)]
+    assert sorted(labels) == ["Alexanderstraße 5", "Bahnhof Alexanderplatz"]
+    assert [entry[0] for _, entry in index.search("alexanderstrasse 5", 5)] == ["Alexanderstraße 5"]
+    assert index.search("bahnhof zoo", 5) == []
+
+
+def test_prefix_search_filters_by_position():
+    index = PrefixIndex()
+    index.add("Hauptbahnhof, Berlin", [13.37, 52.52], "geocode")
+    index.add("Hauptbahnhof, Hamburg", [10.01, 53.55], "geocode")
+
+    found = index.search("hauptbahnhof", 5, where=REGIONS["berlin"].contains)
+    assert [entry[0] for _, entry in found] == ["Hauptbahnhof, Berlin"]
+
+
+def test_region_indexes_are_bounded(monkeypatch, tmp_path):
+    names = [f"city{i}" for i in range(3)]
+    for name in names:
+        monkeypatch.setitem(REGIONS, name, Region(name, "EPSG:25833", (0, 0, 1, 1), {}))
+    monkeypatch.setattr(autocomplete, "MAX_REGION_INDEXES", 2)
+    monkeypatch.setattr(autocomplete, "_region_indexes", autocomplete.OrderedDict())
+
+    first = autocomplete.region_index(str(tmp_path), "city0")
+    autocomplete.region_index(str(tmp_path), "city1")
+    assert autocomplete.region_index(str(tmp_path), "city0") is first
+    autocomplete.region_index(str(tmp_path), "city2")
+
+    assert list(autocomplete._region_indexes) == ["city0", "city2"]
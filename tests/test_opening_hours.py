@@ -0,0 +1,86 @@
+from datetime import datetime
+
+import pytest
+
+from opening_hours import MINUTES_PER_DAY, MINUTES_PER_WEEK, parse_opening_hours
+
+MO, DI, MI, DO, FR, SA, SO = range(7)
+
+
+def minutes(hhmm):
+    hours, _, mins = hhmm.partition(":")
+    return int(hours) * 60 + int(mins or 0)
+
+
+def daily(days, start, end):
+    """(start, end) week-minute intervals for each day, end may pass midnight"""
+    start, end = minutes(start), minutes(end)
+    if end <= start:
+        end += MINUTES_PER_DAY
+    return [(day * MINUTES_PER_DAY + start, day * MINUTES_PER_DAY + end) for day in days]
+
+
+WEEKDAYS = range(MO, SA)
+ALWAYS = [(0, MINUTES_PER_WEEK)]
+
+# free-text schedules as they appear in Datapoints/ -> expected weekly intervals (None = not interpretable)
+CASES = [
+    ("Mo-Sa 07:00-22:00\nSo 10:00-22:00", daily(range(MO, SO), "7", "22") + daily([SO], "10", "22")),
+    ("Mo-Fr 7-20.30h", daily(WEEKDAYS, "7", "20:30")),
+    ("Mo-Do 6-18 Uhr, Fr-7-15 Uhr", daily(range(MO, FR), "6", "18") + daily([FR], "7", "15")),
+    ("werktags 7-18h", daily(range(MO, SO), "7", "18")),
+    ("täglich 6-22 Uhr", daily(range(7), "6", "22")),
+    ("8-20h", daily(range(7), "8", "20")),
+    ("Montag bis Freitag 7:30-15:30\n\n\n\n", daily(WEEKDAYS, "7:30", "15:30")),
+    ("Mo-Fr 7-10h, 14-18h", daily(WEEKDAYS, "7", "10") + daily(WEEKDAYS, "14", "18")),
+    ("Mo,Mi,Fr 9-15h, Di,Do 11-18h", daily([MO, MI, FR], "9", "15") + daily([DI, DO], "11", "18")),
+    ("Mo – Fr 9 – 18 h, Sa 9 – 14 h", daily(WEEKDAYS, "9", "18") + daily([SA], "9", "14")),
+    ("Mo-Fr 18-24h", daily(WEEKDAYS, "18", "24")),
+    # past midnight, Sunday night continues into Monday morning
+    ("Mo-So 12-01h", [(0, 60)] + daily(range(SO), "12", "1") + [(SO * MINUTES_PER_DAY + 720, MINUTES_PER_WEEK)]),
+    ("So 22-02 Uhr", [(0, 120), (SO * MINUTES_PER_DAY + 1320, MINUTES_PER_WEEK)]),
+    ("24h", ALWAYS),
+    ("Durchgehend", ALWAYS),
+    ("ohne", ALWAYS),
+    ("off", []),
+    # seasonal, dated, conditional or without times
+    ("24h (April-Oktober)", None),
+    ("10-19 h von April-September", None),
+    ("Sonn- u. Feiertags 10-13h", None),
+    ("12.5.2020 8-12", None),
+    ("bei Veranstaltungen", None),
+    ("nur während Betriebsablauf 8- 14 Uhr", None),
+    ("Mo-Fr", None),
+    ("keine Angabe", None),
+    ("", None),
+    (None, None),
+]
+
+
+@pytest.mark.parametrize("text, expected", CASES)
+def test_parse_opening_hours(text, expected):
+    hours = parse_opening_hours(text)
+    if expected is None:
+        assert hours is None
+    else:
+        assert hours is not None
+        assert hours.intervals == tuple(sorted(expected))
+
+
+@pytest.mark.parametrize("when, expected", [
+    (datetime(2024, 6, 9, 23, 30), True),   # Sunday night
+    (datetime(2024, 6, 10, 1, 59), True),   # Monday, still Sunday's opening
+    (datetime(2024, 6, 10, 2, 0), False),
+    (datetime(2024, 6, 9, 21, 59), False),
+    (datetime(2024, 6, 10, 22, 30), False),  # Monday night isn't open
+])
+def test_is_open_wraps_sunday_into_monday(when, expected):
+    assert parse_opening_hours("So 22-02 Uhr").is_open(when) is expected
+
+
+def test_is_open_follows_each_rule():
+    hours = parse_opening_hours("Mo-Sa 07:00-22:00\nSo 10:00-22:00")
+    assert hours.is_open(datetime(2024, 6, 8, 7, 0))       # Saturday opening
+    assert not hours.is_open(datetime(2024, 6, 9, 9, 59))  # Sunday opens later
+    assert hours.is_open(datetime(2024, 6, 9, 10, 0))
+    assert not hours.is_open(datetime(2024, 6, 9, 22, 0))
@@ -0,0 +1,24 @@
+from route_geometry import Compaction, compact_geometry, encode_polyline, quantize, simplify
+
+
+def test_quantize_keeps_two_positions_when_a_line_collapses():
+    line = {"type": "LineString", "coordinates": [[13.4, 52.5], [13.4000001, 52.5000001]]}
+    compacted = compact_geometry(line, Compaction(None, None, 2, "geojson"))
+    assert compacted == {"type": "LineString", "coordinates": [[13.4, 52.5], [13.4, 52.5]]}
+
+
+def test_quantize_drops_repeated_vertices():
+    coords = [[13.40001, 52.5], [13.40002, 52.5], [13.41, 52.51], [13.41001, 52.51]]
+    assert quantize(coords, 3) == [[13.4, 52.5], [13.41, 52.51]]
+
+
+def test_simplify_keeps_endpoints_and_corners():
+    # ~700 m east, then ~1.1 km north, with a 1 m wobble on the first leg
+    coords = [[13.40, 52.50], [13.405, 52.50001], [13.41, 52.50], [13.41, 52.51]]
+    assert simplify(coords, 5) == [[13.40, 52.50], [13.41, 52.50], [13.41, 52.51]]
+
+
+def test_encode_polyline_reference():
+    # example from the Google encoded polyline format documentation
+    coords = [[-120.2, 38.5], [-120.95, 40.7], [-126.453, 43.252]]
+    assert encode_polyline(coords) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
@@ -0,0 +1,52 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+def user_profile(user):
+    """The user payload returned by /login and /me"""
+    return {
+        "id": user.id,
+        "email": user.email,
+        "name": user.name,
+        "needs": user.needs,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+    }
+
+
+class ProfileCache:
+    """
+    Bounded LRU of serialized user profiles (user id -> profile dict).
+    Filled on login, invalidated on update/delete in this process; the TTL
+    bounds staleness when another worker changed the user.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, profile = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return profile
+
+    def put(self, user_id, profile):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, profile)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return profile
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)